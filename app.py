@@ -1,232 +1,333 @@
 import os
-import json
-import requests
+import time
+import threading
+import functools
+import ijson
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from flask import Flask, g, render_template, request, jsonify, redirect, url_for, session
+from flask_session import Session
 from dotenv import load_dotenv
+from cachetools import TTLCache, cached
+from http_client import HTTP
+from google_reviews import fetch_google_reviews, ENABLED as GOOGLE_REVIEWS_ENABLED
+
+# orjson parses JSON several times faster than the stdlib; fall back if absent
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
 load_dotenv()
 
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (override with LOG_LEVEL=WARNING in production)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
 
+# Store session data server-side so the cookie carries only a session id
+# instead of the whole approved_reviews dict (signed + resent every request)
+app.config['SESSION_TYPE'] = 'filesystem'
+Session(app)
+
 # Hostaway API Configuration
 HOSTAWAY_BASE_URL = "https://api.hostaway.com/v1"
 HOSTAWAY_ACCOUNT_ID = os.environ.get("HOSTAWAY_ACCOUNT_ID")
 HOSTAWAY_API_KEY = os.environ.get("HOSTAWAY_API_KEY")
 
+# OAuth token request pieces are invariant once env vars are read,
+# so build them once at import instead of per call
+_TOKEN_URL = f"{HOSTAWAY_BASE_URL}/accessTokens"
+_TOKEN_PAYLOAD = (
+    f"grant_type=client_credentials&client_id={HOSTAWAY_ACCOUNT_ID}"
+    f"&client_secret={HOSTAWAY_API_KEY}&scope=general"
+    if HOSTAWAY_ACCOUNT_ID and HOSTAWAY_API_KEY else None
+)
+_TOKEN_HEADERS = {
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'Cache-Control': 'no-cache'
+}
+
 # Use Flask session for approval storage - clean and reliable
 
-def load_mock_reviews():
-    """Load mock reviews from JSON file"""
+# Cache the OAuth access token between requests so each page view only pays
+# for the reviews call, not a fresh token round-trip as well
+_token_cache = {"token": None, "expires_at": 0.0}
+_token_lock = threading.Lock()
+
+# Shared pool for firing independent upstream fetches in parallel
+_POOL = ThreadPoolExecutor(max_workers=4)
+
+def _load_mock_reviews_once():
+    """Parse the mock reviews file a single time at import"""
     try:
-        with open('mock_data/reviews.json', 'r') as f:
-            return json.load(f)
+        with open('mock_data/reviews.json', 'rb') as f:
+            return _loads(f.read())
     except FileNotFoundError:
         logging.error("Mock data file not found")
         return []
-    except json.JSONDecodeError:
+    except ValueError:
         logging.error("Invalid JSON in mock data file")
         return []
 
+_MOCK_REVIEWS = _load_mock_reviews_once()
+
+def load_mock_reviews():
+    """Load mock reviews (parsed once at import, served from memory)"""
+    return _MOCK_REVIEWS
+
 def get_hostaway_access_token():
-    """Get OAuth access token for Hostaway API"""
+    """Get OAuth access token for Hostaway API (cached until near expiry)"""
     try:
         if not HOSTAWAY_API_KEY or not HOSTAWAY_ACCOUNT_ID:
             return None
-            
-        # OAuth 2.0 token request - use URL-encoded format
-        token_url = f"{HOSTAWAY_BASE_URL}/accessTokens"
-        payload = f"grant_type=client_credentials&client_id={HOSTAWAY_ACCOUNT_ID}&client_secret={HOSTAWAY_API_KEY}&scope=general"
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Cache-Control': 'no-cache'
-        }
-        
-        response = requests.post(token_url, data=payload, headers=headers, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            access_token = data.get('access_token')
-            if access_token:
-                logging.info("Successfully obtained Hostaway access token")
-                return access_token
+
+        with _token_lock:
+            # Reuse the cached token until ~60s before it expires
+            if _token_cache["token"] and time.monotonic() < _token_cache["expires_at"] - 60:
+                return _token_cache["token"]
+
+            # OAuth 2.0 token request - use URL-encoded format
+            response = HTTP.post(_TOKEN_URL, data=_TOKEN_PAYLOAD, headers=_TOKEN_HEADERS, timeout=30)
+
+            if response.status_code == 200:
+                data = response.json()
+                access_token = data.get('access_token')
+                if access_token:
+                    expires_in = data.get('expires_in', 3600)
+                    _token_cache["token"] = access_token
+                    _token_cache["expires_at"] = time.monotonic() + expires_in
+                    logging.info("Successfully obtained Hostaway access token")
+                    return access_token
+                else:
+                    logging.error("No access token in response")
+                    return None
             else:
-                logging.error("No access token in response")
+                logging.error(f"Token request failed: {response.status_code} - {response.text}")
                 return None
-        else:
-            logging.error(f"Token request failed: {response.status_code} - {response.text}")
-            return None
-            
+
     except Exception as e:
         logging.error(f"Error getting Hostaway access token: {e}")
         return None
 
 def fetch_hostaway_reviews():
-    """Fetch reviews from Hostaway API with proper OAuth authentication"""
+    """Fetch and normalize reviews from Hostaway API, streaming the response"""
     try:
         # Check if API credentials are available
         if not HOSTAWAY_API_KEY or not HOSTAWAY_ACCOUNT_ID:
             logging.error("Missing Hostaway API credentials. Please set HOSTAWAY_API_KEY and HOSTAWAY_ACCOUNT_ID.")
             return []
-        
+
         # Get OAuth access token
         access_token = get_hostaway_access_token()
         if not access_token:
             logging.error("Could not obtain access token. Check your API credentials.")
             return []
-            
+
         headers = {
             'Authorization': f'Bearer {access_token}',
             'Content-Type': 'application/json',
             'Cache-Control': 'no-cache'
         }
-        
+
         url = f"{HOSTAWAY_BASE_URL}/reviews"
         params = {'accountId': HOSTAWAY_ACCOUNT_ID}
-        
+
         logging.info(f"Fetching Hostaway reviews from: {url} with account ID: {HOSTAWAY_ACCOUNT_ID}")
-        
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('status') == 'success':
-                reviews = data.get('result', [])
-                count = data.get('count', 0)
-                
-                if count > 0:
-                    logging.info(f"Successfully fetched {len(reviews)} authentic Hostaway reviews")
-                    return reviews
-                else:
-                    logging.info("Your Hostaway account has no reviews yet. Create some reviews in Hostaway first.")
-                    return []
-            else:
-                logging.error(f"API returned error status: {data}")
+
+        with HTTP.get(url, headers=headers, params=params, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                logging.error(f"API request failed: {response.status_code} - {response.text}")
                 return []
-        else:
-            logging.error(f"API request failed: {response.status_code} - {response.text}")
+
+            # Stream-parse the result array so the full JSON tree is never
+            # held in memory alongside the normalized list, while also
+            # capturing the top-level status key to catch API-level errors
+            # that arrive with HTTP 200
+            response.raw.decode_content = True
+            reviews = []
+            api_status = None
+            builder = None
+            for prefix, event, value in ijson.parse(response.raw):
+                if prefix == 'status':
+                    api_status = value
+                elif prefix.startswith('result.item'):
+                    if (prefix, event) == ('result.item', 'start_map'):
+                        builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    if (prefix, event) == ('result.item', 'end_map'):
+                        reviews.append(_normalize_hostaway(builder.value))
+                        builder = None
+
+        if api_status != 'success':
+            logging.error(f"API returned error status: {api_status}")
             return []
-            
+
+        if reviews:
+            logging.info(f"Successfully fetched {len(reviews)} authentic Hostaway reviews")
+        else:
+            logging.info("Your Hostaway account has no reviews yet. Create some reviews in Hostaway first.")
+        return reviews
+
     except Exception as e:
         logging.error(f"Error fetching Hostaway reviews: {e}")
         return []
 
-def normalize_review(review, source="Hostaway"):
-    """Normalize review data structure"""
-    if source == "google":
-        # Google reviews are already normalized, just ensure approval status
-        review_id = str(review.get('id'))
-        
-        # Check approval status from session
-        if 'approved_reviews' not in session:
-            session['approved_reviews'] = {}
-        is_approved = session['approved_reviews'].get(review_id, False)
-        
-        # Return Google review with approval status
-        review['approved'] = is_approved
-        return review
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(timestamp):
+    """Parse an ISO-8601 timestamp, caching repeated values"""
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+def _normalize_google(review, source="google"):
+    """Google reviews arrive already normalized"""
+    return review
+
+def _normalize_hostaway(review, source="Hostaway"):
+    """Normalize a Hostaway/Demo review (approval status is applied per-view)"""
+    # Get category ratings from reviewCategory array
+    review_categories = review.get('reviewCategory', [])
+
+    # Average the category ratings in pure integer arithmetic
+    # ((sum + n//2) // n rounds half up); default to 5 without ratings
+    ratings = [cat['rating'] for cat in review_categories if cat.get('rating')]
+    overall_rating = (sum(ratings) + len(ratings) // 2) // len(ratings) if ratings else 5
     
-    elif source in ["Hostaway", "Demo"]:
-        # Get category ratings from reviewCategory array
-        review_categories = review.get('reviewCategory', [])
-        overall_rating = 0
-        
-        # Calculate overall rating from category ratings
-        if review_categories:
-            total_rating = sum(cat.get('rating', 0) for cat in review_categories)
-            overall_rating = round(total_rating / len(review_categories))
-        
-        # Create normalized structure
-        review_id = str(review.get('id'))
-        
-        # Convert category ratings to both original and normalized formats
-        category_ratings_display = []
-        review_category = {}
-        
-        if review_categories:
-            for cat in review_categories:
-                category_name = cat.get('category', '').lower()
-                rating = cat.get('rating', 0)
-                
-                # For display in dashboard (preserve original structure)
-                category_ratings_display.append({
-                    'category': category_name,
-                    'rating': rating
-                })
-                
-                # For internal processing and filtering
-                review_category[category_name] = rating
-        
-        # Parse date
-        review_date = None
-        if review.get('submittedAt'):
-            try:
-                from datetime import datetime
-                review_date = datetime.fromisoformat(review.get('submittedAt').replace('Z', '+00:00'))
-            except:
-                review_date = None
-        
-        # Check approval status from session
-        if 'approved_reviews' not in session:
-            session['approved_reviews'] = {}
-        is_approved = session['approved_reviews'].get(review_id, False)
-        
-        return {
-            'id': review_id,
-            'listing_id': review.get('listingId', 'unknown'),
-            'listing_name': review.get('listingName', 'Unknown Property'),
-            'guest_name': review.get('guestName', 'Anonymous'),
-            'guest_location': review.get('guestLocation', ''),
-            'review_text': review.get('publicReview', ''),
-            'overall_rating': int(overall_rating) if overall_rating else 5,
-            'category_ratings': category_ratings_display,  # Correct format for display
-            'review_category': review_category,    # Parsed format for filtering
-            'review_date': review_date,
-            'date': review.get('submittedAt', ''), # Keep original date field too
-            'channel': source,
-            'approved': is_approved
-        }
+    # Create normalized structure
+    review_id = str(review.get('id'))
     
-    return review
+    # Convert category ratings to both original and normalized formats
+    # in one pass; binding .append locally keeps the loop cheap
+    category_ratings_display = []
+    review_category = {}
+    display_append = category_ratings_display.append
 
-def get_all_reviews():
-    """Get all reviews from multiple sources: Hostaway API and Google Reviews"""
-    all_reviews = []
+    for cat in review_categories:
+        category_name = cat.get('category', '').lower()
+        rating = cat.get('rating', 0)
+        # Display format for the dashboard; parsed map for filtering
+        display_append({'category': category_name, 'rating': rating})
+        review_category[category_name] = rating
+    
+    # Parse date
+    review_date = None
+    if review.get('submittedAt'):
+        try:
+            review_date = _parse_iso(review.get('submittedAt'))
+        except:
+            review_date = None
     
-    # Get Hostaway reviews
-    hostaway_reviews = fetch_hostaway_reviews()
+    return {
+        'id': review_id,
+        'listing_id': str(review.get('listingId', 'unknown')),
+        'listing_name': review.get('listingName', 'Unknown Property'),
+        'guest_name': review.get('guestName', 'Anonymous'),
+        'guest_location': review.get('guestLocation', ''),
+        'review_text': review.get('publicReview', ''),
+        'overall_rating': overall_rating,
+        'category_ratings': category_ratings_display,  # Correct format for display
+        'review_category': review_category,    # Parsed format for filtering
+        'review_date': review_date,
+        'date': review.get('submittedAt', ''), # Keep original date field too
+        'channel': source,
+        'approved': False
+    }
+
+# Dispatch on source once per batch instead of branching per review
+_NORMALIZERS = {
+    'Hostaway': _normalize_hostaway,
+    'Demo': _normalize_hostaway,
+    'google': _normalize_google,
+}
+
+def normalize_review(review, source="Hostaway"):
+    """Normalize review data structure (approval status is applied per-view)"""
+    normalizer = _NORMALIZERS.get(source)
+    return normalizer(review, source) if normalizer else review
+
+def _fetch_all_reviews():
+    """Fetch and normalize reviews from all sources"""
+    all_reviews = []
+
+    # Hostaway and Google are independent - fetch them in parallel so a
+    # refresh costs max(hostaway_rtt, google_rtt) instead of their sum.
+    # Skip Google entirely when no API key was configured at startup.
+    hostaway_future = _POOL.submit(fetch_hostaway_reviews)
+    google_future = _POOL.submit(fetch_google_reviews) if GOOGLE_REVIEWS_ENABLED else None
+
+    # Get Hostaway reviews (already normalized while streaming)
+    hostaway_reviews = hostaway_future.result()
     if hostaway_reviews:
-        normalized_hostaway = [normalize_review(review, source="Hostaway") for review in hostaway_reviews]
-        all_reviews.extend(normalized_hostaway)
-        logging.info(f"✓ Loaded {len(normalized_hostaway)} authentic Hostaway reviews")
+        all_reviews.extend(hostaway_reviews)
+        logging.info(f"✓ Loaded {len(hostaway_reviews)} authentic Hostaway reviews")
     else:
         # Fallback to demo data when no real reviews exist
         mock_reviews = load_mock_reviews()
         if mock_reviews:
-            normalized_mock = [normalize_review(review, source="Demo") for review in mock_reviews]
+            normalized_mock = [_normalize_hostaway(review, source="Demo") for review in mock_reviews]
             all_reviews.extend(normalized_mock)
             logging.info(f"⚠ No reviews in Hostaway account - showing {len(normalized_mock)} demo reviews for testing")
-    
+
     # Get Google Reviews
-    try:
-        from google_reviews import fetch_google_reviews
-        google_reviews = fetch_google_reviews()
-        if google_reviews:
-            # Google reviews are already normalized
-            google_normalized = [normalize_review(review, source='google') for review in google_reviews]
-            all_reviews.extend(google_normalized)
-            logging.info(f"Added {len(google_normalized)} Google Reviews")
-    except Exception as e:
-        logging.warning(f"Could not fetch Google Reviews: {e}")
+    if google_future is not None:
+        try:
+            fetched_google = google_future.result()
+            if fetched_google:
+                # Google reviews are already normalized
+                all_reviews.extend(fetched_google)
+                logging.info(f"Added {len(fetched_google)} Google Reviews")
+        except Exception as e:
+            logging.warning(f"Could not fetch Google Reviews: {e}")
     
     logging.info(f"Total reviews from all sources: {len(all_reviews)}")
     return all_reviews
 
+@dataclass
+class ReviewIndex:
+    """Precomputed lookups over the normalized review list"""
+    all: list
+    by_listing: dict  # listing_id (str) -> list of reviews
+
+@cached(TTLCache(maxsize=1, ttl=60), lock=threading.Lock())
+def get_review_index():
+    """Fetch reviews and build the per-listing index (shared TTL cache)
+
+    The index is independent of any user session, so repeated page loads
+    within the cache TTL reuse it instead of re-hitting the APIs.
+    """
+    all_reviews = _fetch_all_reviews()
+    by_listing = {}
+    for review in all_reviews:
+        by_listing.setdefault(review['listing_id'], []).append(review)
+    return ReviewIndex(all=all_reviews, by_listing=by_listing)
+
+def apply_approvals(reviews, approved_map):
+    """Stamp per-user approval status onto cached reviews without mutating them"""
+    return [{**r, 'approved': bool(approved_map.get(r['id'], False))} for r in reviews]
+
+def get_approved_index():
+    """Approved-only projections of the cached reviews, built once per request
+
+    Returns (approved_all, approved_by_listing) and memoizes them on
+    flask.g so multiple lookups within a request share one pass.
+    """
+    if 'approved_index' not in g:
+        approved_map = session.get('approved_reviews') or {}
+        approved_all = [r for r in get_review_index().all if approved_map.get(r['id'])]
+        approved_by_listing = {}
+        for review in approved_all:
+            approved_by_listing.setdefault(review['listing_id'], []).append(review)
+        g.approved_index = (approved_all, approved_by_listing)
+    return g.approved_index
+
+def get_all_reviews():
+    """Get all reviews from multiple sources: Hostaway API and Google Reviews"""
+    return get_review_index().all
+
 @app.route('/')
 def index():
     """Landing page with all approved reviews"""
@@ -236,24 +337,18 @@ def index():
 def reviews_display():
     """Public reviews display page showing all approved reviews"""
     all_reviews = get_all_reviews()
+    approved_reviews, _ = get_approved_index()
+    logging.info("reviews_display: total=%d approved=%d", len(all_reviews), len(approved_reviews))
     
-    # Debug: Log all reviews and their approval status
-    logging.info(f"Total reviews loaded: {len(all_reviews)}")
-    for review in all_reviews:
-        logging.info(f"Review {review['id']}: approved={review['approved']}")
-    
-    approved_reviews = [r for r in all_reviews if r['approved']]
-    logging.info(f"Approved reviews count: {len(approved_reviews)}")
-    
-    # Calculate statistics
+    # Calculate summary statistics in a single pass
+    props = {}
+    total_rating = 0
+    for review in approved_reviews:
+        props[review['listing_id']] = None
+        total_rating += review['overall_rating']
     total_reviews = len(approved_reviews)
-    total_properties = len(set(r['listing_id'] for r in approved_reviews)) if approved_reviews else 0
-    
-    # Calculate average rating
-    average_rating = 0
-    if approved_reviews:
-        total_rating = sum(review['overall_rating'] for review in approved_reviews)
-        average_rating = round(total_rating / len(approved_reviews), 1)
+    total_properties = len(props)
+    average_rating = round(total_rating / total_reviews, 1) if total_reviews else 0
     
     return render_template('reviews_display.html',
                          approved_reviews=approved_reviews,
@@ -269,19 +364,17 @@ def dashboard():
 @app.route('/property/<int:property_id>')
 def property_page(property_id):
     """Property-specific page showing approved reviews"""
-    reviews = get_all_reviews()
-    property_reviews = [r for r in reviews if str(r['listing_id']) == str(property_id) and r['approved']]
-    
+    idx = get_review_index()
+    _, approved_by_listing = get_approved_index()
+    property_reviews = approved_by_listing.get(str(property_id), [])
+    listing_reviews = idx.by_listing.get(str(property_id), [])
+
     # Get property name from first review or use generic name
     property_name = "Property"
     if property_reviews:
         property_name = property_reviews[0]['listing_name']
-    elif reviews:
-        # Find any review for this property to get the name
-        for review in reviews:
-            if str(review['listing_id']) == str(property_id):
-                property_name = review['listing_name']
-                break
+    elif listing_reviews:
+        property_name = listing_reviews[0]['listing_name']
     
     # Calculate average rating
     average_rating = 0
@@ -298,7 +391,8 @@ def property_page(property_id):
 @app.route('/api/reviews/hostaway')
 def api_hostaway_reviews():
     """API endpoint to get normalized Hostaway reviews"""
-    reviews = get_all_reviews()
+    approved_map = session.get('approved_reviews', {})
+    reviews = apply_approvals(get_all_reviews(), approved_map)
     return jsonify({'status': 'success', 'reviews': reviews})
 
 @app.route('/api/reviews/approve', methods=['POST'])
@@ -333,13 +427,11 @@ def api_approve_review():
 @app.route('/api/reviews/status')
 def api_review_status():
     """API endpoint to get current approval status for debugging"""
-    if 'approved_reviews' not in session:
-        session['approved_reviews'] = {}
-    
+    approved_map = session.get('approved_reviews') or {}
     return jsonify({
         'status': 'success',
-        'approval_status': session['approved_reviews'],
-        'total_approved': len([k for k, v in session['approved_reviews'].items() if v])
+        'approval_status': approved_map,
+        'total_approved': len([k for k, v in approved_map.items() if v])
     })
 
 @app.route('/api/reviews/reset', methods=['POST'])
@@ -358,8 +450,6 @@ def api_reset_approvals():
 def api_google_reviews():
     """Endpoint for Google Reviews integration with user-provided API key"""
     try:
-        from google_reviews import fetch_google_reviews
-        
         # Get API key from request parameters
         api_key = request.args.get('api_key')
         place_id = request.args.get('place_id', 'ChIJd8BlQ2BZwokRAFUEcm_qrcA')
@@ -6,6 +6,20 @@ import os
 import requests
 import logging
 from datetime import datetime
+from dotenv import load_dotenv
+from requests_cache import CachedSession
+load_dotenv()
+
+# Places data changes rarely, so cache responses at the HTTP layer:
+# repeat lookups within the hour are served from SQLite instead of
+# spending a network round-trip and Places API quota
+HTTP = CachedSession('google_cache', backend='sqlite', expire_after=3600,
+                     allowable_codes=(200,))
+
+# Read the API key once at import; callers may still pass their own key.
+# ENABLED lets consumers skip the Google fetch entirely when unconfigured.
+_GOOGLE_API_KEY = os.getenv('GOOGLE_PLACES_API_KEY')
+ENABLED = bool(_GOOGLE_API_KEY)
 
 def fetch_google_reviews(place_id="ChIJd8BlQ2BZwokRAFUEcm_qrcA", api_key=None):
     """
@@ -19,8 +33,8 @@ def fetch_google_reviews(place_id="ChIJd8BlQ2BZwokRAFUEcm_qrcA", api_key=None):
         dict: Reviews data with status and reviews list
     """
     
-    # Use provided API key or get from environment
-    google_api_key = api_key or os.getenv('GOOGLE_PLACES_API_KEY')
+    # Use provided API key or the one read at import
+    google_api_key = api_key or _GOOGLE_API_KEY
     
     if not google_api_key:
         logging.warning("No Google Places API key found - using fallback data")
@@ -36,7 +50,7 @@ def fetch_google_reviews(place_id="ChIJd8BlQ2BZwokRAFUEcm_qrcA", api_key=None):
             'language': 'fr'  # French language preference
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = HTTP.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -51,6 +65,9 @@ def fetch_google_reviews(place_id="ChIJd8BlQ2BZwokRAFUEcm_qrcA", api_key=None):
         # Normalize Google Reviews to our format
         normalized_reviews = []
         for i, review in enumerate(reviews):
+            # isoformat produces the same 'YYYY-MM-DD HH:MM:SS' shape as the
+            # old strftime call without the format-string interpretation cost
+            ts = review.get('time', 0)
             normalized_review = {
                 'id': f'google_{i+1}',
                 'listing_id': place_id,
@@ -59,7 +76,7 @@ def fetch_google_reviews(place_id="ChIJd8BlQ2BZwokRAFUEcm_qrcA", api_key=None):
                 'review_text': review.get('text', ''),
                 'overall_rating': review.get('rating', 5),
                 'category_ratings': [],  # Google doesn't provide category breakdowns
-                'date': datetime.fromtimestamp(review.get('time', 0)).strftime('%Y-%m-%d %H:%M:%S'),
+                'date': datetime.fromtimestamp(ts).isoformat(' ', 'seconds') if ts else '',
                 'channel': 'Google',
                 'guest_location': '',
                 'approved': False
@@ -98,8 +115,8 @@ def get_google_place_id(address, api_key=None):
     Returns:
         str: Place ID if found, None otherwise
     """
-    google_api_key = api_key or os.getenv('GOOGLE_PLACES_API_KEY')
-    
+    google_api_key = api_key or _GOOGLE_API_KEY
+
     if not google_api_key:
         return None
     
@@ -112,7 +129,7 @@ def get_google_place_id(address, api_key=None):
             'key': google_api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = HTTP.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
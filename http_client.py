@@ -0,0 +1,15 @@
+"""
+Shared HTTP session for outbound API calls
+Reuses keep-alive connections so Hostaway and Google calls skip the
+per-request TCP + TLS handshake
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+HTTP = requests.Session()
+HTTP.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))